@@ -1,9 +1,21 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+import asyncio
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from .deadlines import run_deadline, latency_history
+from .model_config import SECTION_MODELS, DEFAULT_MODEL_TIER
+
+# Retries of rate-limited, dropped or 5xx calls before escalating to the next model
+MAX_RETRIES = 2
+RETRY_BACKOFF = 1.0
+
+# Generators can run in threads, so each message is printed in one piece
+_print_lock = threading.Lock()
 
 class BaseGenerator:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, model_config=None):
         """Initialize the base generator with OpenAI client."""
         if api_key is None:
             load_dotenv()
@@ -14,6 +26,139 @@ class BaseGenerator:
             
         self.client = OpenAI(api_key=api_key)
         self.context = {}
+        self.model_config = model_config if model_config is not None else SECTION_MODELS
+        self.call_metrics = []
+        # Set when any part of the result is canned fallback content rather than a model response
+        self.used_fallback = False
+
+    def _create_completion(self, section, **kwargs):
+        """Create a chat completion on the section's model tier, escalating on failed calls.
+
+        Each call is bounded by the section budget and the overall run deadline.
+        When hedging is enabled, a call slower than the configured latency
+        percentile gets a duplicate request and the first response wins.
+        """
+        tier = self.model_config.get(section, DEFAULT_MODEL_TIER)
+        models = tier["models"]
+        budget = tier.get("budget") or DEFAULT_MODEL_TIER["budget"]
+
+        for index, model in enumerate(models):
+            try:
+                return self._call_model(section, model, budget, kwargs)
+            except (APIConnectionError, InternalServerError, RateLimitError) as e:
+                # Timeouts, dropped connections, 5xx and rate limits move on to the next model
+                if index == len(models) - 1:
+                    raise
+                status = "timeout" if isinstance(e, APITimeoutError) else "error"
+                self._log(f"{section}: {model} failed ({status}: {e}), escalating to {models[index + 1]}")
+
+    def _call_model(self, section, model, budget, kwargs):
+        """Call one model, retrying rate limits and transient errors while its budget lasts."""
+        budget_ends = time.monotonic() + budget
+        attempt = 0
+
+        while True:
+            timeout = run_deadline.clip(budget_ends - time.monotonic())
+            hedge_after = latency_history.hedge_after(section, model, budget)
+            started = time.perf_counter()
+            try:
+                if hedge_after is not None and hedge_after < timeout:
+                    response, hedged, latency = asyncio.run(
+                        self._hedged_completion(section, model, timeout, hedge_after, kwargs))
+                else:
+                    client = self.client.with_options(timeout=timeout, max_retries=0)
+                    response, hedged = client.chat.completions.create(model=model, **kwargs), False
+                    latency = None
+            except APITimeoutError:
+                # The budget is spent, so there is no time left to retry
+                self._record_call(section, model, started, "timeout")
+                raise
+            except (APIConnectionError, InternalServerError, RateLimitError) as e:
+                self._record_call(section, model, started, "error")
+                delay = self._retry_delay(e, attempt)
+                remaining = run_deadline.remaining()
+                if (attempt >= MAX_RETRIES or budget_ends - time.monotonic() <= delay or
+                        (remaining is not None and remaining <= delay)):
+                    raise
+                attempt += 1
+                self._log(f"{section}: {model} failed ({e}), retrying in {delay:.1f}s (attempt {attempt})")
+                time.sleep(delay)
+                continue
+            except Exception:
+                self._record_call(section, model, started, "error")
+                raise
+
+            self._record_call(section, model, started, "hedged" if hedged else "ok", response, latency)
+            return response
+
+    def _retry_delay(self, error, attempt):
+        """Return how long to wait before retrying, honouring the server's Retry-After header."""
+        delay = RETRY_BACKOFF * 2 ** attempt
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                delay = max(delay, float(response.headers.get("retry-after", 0)))
+            except ValueError:
+                pass
+        return delay
+
+    async def _hedged_completion(self, section, model, timeout, hedge_after, kwargs):
+        """Race a duplicate request against a slow one and cancel whichever loses.
+
+        Returns the response, whether a hedged request was sent and the winning
+        request's own latency.
+        """
+        async with AsyncOpenAI(api_key=self.client.api_key, timeout=timeout, max_retries=0) as client:
+            primary = asyncio.create_task(client.chat.completions.create(model=model, **kwargs))
+            started = {primary: time.perf_counter()}
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done:
+                return primary.result(), False, time.perf_counter() - started[primary]
+
+            self._log(f"{section}: {model} slower than {hedge_after:.1f}s, sending a hedged request")
+            backup_client = client.with_options(timeout=max(timeout - hedge_after, 1))
+            backup = asyncio.create_task(backup_client.chat.completions.create(model=model, **kwargs))
+            started[backup] = time.perf_counter()
+
+            pending = {primary, backup}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        for other in pending:
+                            other.cancel()
+                        await asyncio.gather(*pending, return_exceptions=True)
+                        return task.result(), True, time.perf_counter() - started[task]
+                    error = task.exception()
+            raise error
+
+    def _log(self, message):
+        """Print a message without interleaving it with output from other threads."""
+        with _print_lock:
+            print(message)
+
+    def _record_call(self, section, model, started, status, response=None, latency=None):
+        """Record which model served a call, how long it took and its token usage.
+
+        latency is the winning request's own duration when the call was hedged.
+        """
+        metric = {
+            "section": section,
+            "model": model,
+            "seconds": round(time.perf_counter() - started, 3),
+            "status": status,
+        }
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            metric["prompt_tokens"] = usage.prompt_tokens
+            metric["completion_tokens"] = usage.completion_tokens
+        # Failed calls end early or at the timeout, so they would skew the hedging percentile
+        # A hedged call's total time includes the wait before hedging, which would
+        # push the percentile up on every hedge, so only the winner's own time counts
+        if status in ("ok", "hedged"):
+            latency_history.record(section, model, metric["seconds"] if latency is None else latency)
+        self.call_metrics.append(metric)
 
     def _clean_text(self, text):
         """Clean text by removing unwanted characters and formatting."""
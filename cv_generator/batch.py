@@ -0,0 +1,108 @@
+import gc
+import json
+import os
+from docx2pdf import convert
+from .cv_generator import CVGenerator
+from .vacancy_ingestion import VacancyIngestion
+
+
+class ResultsSink:
+    def __init__(self, path="cv_results.jsonl"):
+        """Initialize a streaming JSONL sink that holds one record per posting."""
+        self.path = path
+
+    def write(self, record):
+        """Append a single record as one compact JSON line."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+
+    def read(self):
+        """Yield the stored records one at a time without loading the whole file."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Warning: Skipping unreadable record in {self.path}")
+
+    def completed_hashes(self):
+        """Return the vacancy hashes whose latest record has no fallback content."""
+        complete = {}
+        for record in self.read():
+            complete[record.get("vacancy_hash")] = not record.get("fallback_sections")
+        return {vacancy_hash for vacancy_hash, ok in complete.items() if ok}
+
+    def read_latest(self):
+        """Yield only the latest record per vacancy, keeping just their line numbers in memory."""
+        latest = {}
+        for index, record in enumerate(self.read()):
+            latest[record.get("vacancy_hash")] = index
+        wanted = set(latest.values())
+
+        for index, record in enumerate(self.read()):
+            if index in wanted:
+                yield record
+
+
+def run_batch(vacancy_paths, results_path="cv_results.jsonl", journal_path="cv_run_journal.jsonl",
+              resume=False, run_deadline_seconds=None, vacancy_token_budget=4000):
+    """Generate every posting and stream its record to disk as soon as it finishes."""
+    sink = ResultsSink(results_path)
+    done = sink.completed_hashes() if resume else set()
+
+    for index, vacancy_path in enumerate(vacancy_paths, start=1):
+        print(f"\n=== Posting {index}/{len(vacancy_paths)}: {vacancy_path} ===")
+        try:
+            ingestion = VacancyIngestion(vacancy_token_budget)
+            ingestion.ingest(vacancy_path)
+        except FileNotFoundError:
+            print(f"Warning: Vacancy description file not found at {vacancy_path}")
+            continue
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            # One unreadable posting must not stop the rest of the batch
+            print(f"Warning: Skipping {vacancy_path}, it could not be read: {e}")
+            continue
+
+        # Check the results before building a generator, which would replay the journal
+        if ingestion.source_hash in done:
+            print(f"Skipping {vacancy_path}, already in {results_path}")
+            continue
+
+        ingestion.print_report()
+        cv_generator = CVGenerator(vacancy_path, journal_path=journal_path, resume=resume,
+                                   run_deadline_seconds=run_deadline_seconds, ingestion=ingestion)
+
+        cv_generator.generate_all_sections(render=False)
+        sink.write(cv_generator.to_record())
+        # Keep the good sections of a posting with fallback content so --resume only redoes the rest
+        if not cv_generator.fallback_sections:
+            cv_generator.journal.clear()
+
+        # Release generator state before moving on to the next posting
+        del cv_generator
+        gc.collect()
+
+
+def render_from_results(results_path="cv_results.jsonl", output_dir=".", template_path="CV_template.docx",
+                        pdf=False):
+    """Render DOCX (and optionally PDF) files from the latest record per posting."""
+    rendered = []
+    for record in ResultsSink(results_path).read_latest():
+        cv_generator = CVGenerator(None, template_path=template_path)
+        cv_generator.context = record.get("context", {})
+
+        output_docx_path = os.path.join(output_dir, f"CV_{record['vacancy_hash']}.docx")
+        if not cv_generator.render_template(output_docx_path):
+            continue
+        if pdf:
+            convert(output_docx_path, os.path.splitext(output_docx_path)[0] + ".pdf")
+        rendered.append(output_docx_path)
+
+    print(f"Rendered {len(rendered)} CV(s) from {results_path}")
+    return rendered
@@ -1,57 +1,156 @@
 from docxtpl import DocxTemplate
 from docx2pdf import convert
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import os
 import re
+import time
 from .generators.role_generator import RoleGenerator
 from .generators.skills_generator import SkillsGenerator
 from .generators.summary_generator import SummaryGenerator
 from .generators.self_study_generator import SelfStudyGenerator
+from .run_journal import RunJournal
+from .fast_renderer import load_fast_template
+from .tracing import tracer
+from .deadlines import run_deadline
+from .vacancy_ingestion import VacancyIngestion
+
+
+def _render_docx(template_path, rich_context, output_docx_path):
+    """Render a single template with an already styled context and save it."""
+    with tracer.span("template_load", "render", renderer="docxtpl"):
+        doc = DocxTemplate(template_path)
+    with tracer.span("render_document", "render", renderer="docxtpl"):
+        doc.render(rich_context)
+        doc.save(output_docx_path)
+    return output_docx_path
+
+
+def _render_fast(fast_template, styled_context, output_docx_path):
+    """Render a compiled fast-path template and save it."""
+    with tracer.span("render_document", "render", renderer="fast"):
+        fast_template.render(styled_context, output_docx_path)
+    return output_docx_path
+
+
+def _traced_worker(trace_state, render, *args):
+    """Run a render in a worker process and return its spans along with the result."""
+    tracer.start_worker(trace_state)
+    result = render(*args)
+    return result, tracer.events
+
+
+def _output_name_for_template(template_path):
+    """Derive the output DOCX file name from a template file name."""
+    stem = os.path.splitext(os.path.basename(template_path))[0]
+    name = stem.replace("_template", "")
+    if not name or name == stem:
+        # Never write over the template itself
+        name = f"{stem}_rendered"
+    return f"{name}.docx"
+
+
+def _output_names_for_templates(template_paths):
+    """Derive an output name per template, prefixing the parent directory on collisions."""
+    names = {path: _output_name_for_template(path) for path in template_paths}
+    counts = {}
+    for name in names.values():
+        counts[name] = counts.get(name, 0) + 1
+
+    used = set()
+    for path, name in names.items():
+        if counts[name] > 1:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            name = f"{parent}_{name}" if parent else name
+        # Same file name in directories with the same name as well
+        candidate, index = name, 2
+        while candidate in used:
+            candidate = f"{os.path.splitext(name)[0]}_{index}.docx"
+            index += 1
+        used.add(candidate)
+        names[path] = candidate
+    return names
+
 
 class CVGenerator:
-    def __init__(self, vacancy_text_path="vacancy_description.txt", template_path="CV_template.docx"):
-        self.vacancy_text = self._load_vacancy_text(vacancy_text_path)
+    # Section names in generation order, keyed by their menu number
+    SECTIONS = {
+        1: "roles",
+        2: "skills",
+        3: "summary",
+        4: "self_study",
+    }
+
+    def __init__(self, vacancy_text_path="vacancy_description.txt", template_path="CV_template.docx",
+                 journal_path="cv_run_journal.jsonl", resume=False, fast_render=True,
+                 model_config=None, run_deadline_seconds=None, vacancy_token_budget=4000,
+                 ingestion=None):
+        self.vacancy_text_path = vacancy_text_path
+        if ingestion is not None:
+            # The posting was already ingested by the caller
+            self.ingestion = ingestion
+            self.vacancy_text = ingestion.text
+        else:
+            self.ingestion = VacancyIngestion(vacancy_token_budget)
+            self.vacancy_text = self._load_vacancy_text(vacancy_text_path)
         self.template_path = template_path
+        self.fast_render = fast_render
+        self.model_config = model_config
+        self.run_deadline_seconds = run_deadline_seconds
         self.context = {}
         self.role_descriptions = {}
         self.selected_role_keywords = {}
+        self.job_keywords = []
+        self.section_timings = {}
+        self.model_usage = []
+        self.fallback_sections = []
+
+        # Journal of completed sections so an interrupted run can be resumed
+        # Keyed by the raw posting, so resuming with another token budget still finds the journal
+        self.journal = RunJournal(journal_path, self.vacancy_text, vacancy_hash=self.ingestion.source_hash)
+        self.completed_sections = self.journal.replay() if resume else {}
+        if self.completed_sections:
+            print(f"Resuming run: {len(self.completed_sections)} section(s) found in {journal_path}")
 
         # Initialize default role information
         self._init_default_info()
 
     def _load_vacancy_text(self, path):
-        """Load the vacancy description text."""
+        """Load the vacancy description, stripped of markup and boilerplate."""
+        if not path:
+            return ""
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
+            text = self.ingestion.ingest(path)
+            self.ingestion.print_report()
+            return text
         except FileNotFoundError:
             print(f"Warning: Vacancy description file not found at {path}")
             return ""
 
     def _init_default_info(self):
-        """Initialize default role information dictionary."""
+        """Initialize the default bullet points of each role."""
         self.default_info = {
-            "LUCID": (
-                "Architected and implemented an adaptive AI-driven prompting system for a VR app serving autistic children, resulting in 40% increased session duration and measurably improved learning outcomes across key metrics, "
-                "Developed asynchronous programming patterns for the VR app's third-party SDK integrations, ensuring smooth interaction between different system components"
-            ),
-            "GALAXY": (
-                "Engineered high-performance, scalable gameplay features in C# for multi-platform titles, resulting an increase in player retention and successful deployment across mobile platforms, "
-                "Designed and implemented a comprehensive UI architecture using MVVM pattern that reduced iteration time by ~30% and enabled artists to modify interfaces without programmer intervention, "
-                "Optimized rendering pipelines and memory management systems that improved frame rates on low-end mobile devices, "
-                "Established code quality standards and review processes that reduced critical bugs in production builds while mentoring junior developers on optimization techniques"
-            ),
-            "WHIMSY": (
-                "Architected core networking systems for a multiplayer game with focus on profiling and optimizing GPU/CPU performance to support concurrent players, "
-                "Integrated third-party SDKs (analytics, ads, IAP) into the game ecosystem while maintaining performance standards on mobile platform requirements"
-            ),
-            "APPSIDE": (
-                "Engineered reusable component systems using advanced C# techniques while adhering to OOP principles and SOLID design patterns, "
-                "Developed performance-optimized systems for mobile games with careful attention to memory usage and battery efficiency"
-            ),
-            "WOUFF": (
-                "Optimized critical rendering systems with URP, improving overall performance while maintaining visual quality, "
-                "Implemented responsive UI frameworks that automatically adapted to different screen resolutions and aspect ratios across mobile platform requirements"
-            )
+            "LUCID": [
+                "Architected and implemented an adaptive AI-driven prompting system for a VR app serving autistic children, resulting in 40% increased session duration and measurably improved learning outcomes across key metrics",
+                "Developed asynchronous programming patterns for the VR app's third-party SDK integrations, ensuring smooth interaction between different system components",
+            ],
+            "GALAXY": [
+                "Engineered high-performance, scalable gameplay features in C# for multi-platform titles, resulting an increase in player retention and successful deployment across mobile platforms",
+                "Designed and implemented a comprehensive UI architecture using MVVM pattern that reduced iteration time by ~30% and enabled artists to modify interfaces without programmer intervention",
+                "Optimized rendering pipelines and memory management systems that improved frame rates on low-end mobile devices",
+                "Established code quality standards and review processes that reduced critical bugs in production builds while mentoring junior developers on optimization techniques",
+            ],
+            "WHIMSY": [
+                "Architected core networking systems for a multiplayer game with focus on profiling and optimizing GPU/CPU performance to support concurrent players",
+                "Integrated third-party SDKs (analytics, ads, IAP) into the game ecosystem while maintaining performance standards on mobile platform requirements",
+            ],
+            "APPSIDE": [
+                "Engineered reusable component systems using advanced C# techniques while adhering to OOP principles and SOLID design patterns",
+                "Developed performance-optimized systems for mobile games with careful attention to memory usage and battery efficiency",
+            ],
+            "WOUFF": [
+                "Optimized critical rendering systems with URP, improving overall performance while maintaining visual quality",
+                "Implemented responsive UI frameworks that automatically adapted to different screen resolutions and aspect ratios across mobile platform requirements",
+            ]
         }
 
         # Define role configurations
@@ -98,122 +197,263 @@ class CVGenerator:
     def generate_selected_sections(self, sections):
         """Generate only the selected sections of the CV."""
         print("\nGenerating selected sections...")
+        run_deadline.start(self.run_deadline_seconds)
         
         # Track if we need to render the template at the end
         needs_rendering = False
         
-        if 1 in sections:
-            print("\nGenerating cohesive role descriptions...")
-            role_generator = RoleGenerator(self.vacancy_text, self.default_info, self.roles_config)
-            self.role_descriptions, self.selected_role_keywords = role_generator.generate()
-            self.context.update(role_generator.context)
-            needs_rendering = True
-            
-        if 2 in sections:
-            print("\nGenerating skills sections...")
-            skills_generator = SkillsGenerator(self.vacancy_text)
-            self.context.update(skills_generator.generate())
-            needs_rendering = True
-            
-        if 3 in sections:
-            print("\nGenerating professional summary...")
-            summary_generator = SummaryGenerator(self.vacancy_text, self.role_descriptions)
-            self.context.update(summary_generator.generate())
-            needs_rendering = True
-            
-        if 4 in sections:
-            print("\nGenerating self-study entries...")
-            self_study_generator = SelfStudyGenerator(self.vacancy_text)
-            self.context.update(self_study_generator.generate())
-            needs_rendering = True
+        for number, section in self.SECTIONS.items():
+            if number in sections:
+                self._run_section(section)
+                needs_rendering = True
             
         if needs_rendering:
             print("\nRendering CV template...")
-            self.render_template()
+            if self.render_template():
+                self.journal.clear()
+                self.completed_sections = {}
             
         return True
 
-    def generate_all_sections(self):
+    def generate_all_sections(self, render=True):
         """Generate all sections of the CV."""
         print("\nGenerating all sections...")
+        run_deadline.start(self.run_deadline_seconds)
         
-        # Generate role descriptions first as other sections depend on it
-        role_generator = RoleGenerator(self.vacancy_text, self.default_info, self.roles_config)
-        self.role_descriptions, self.selected_role_keywords = role_generator.generate()
-        self.context.update(role_generator.context)
-        
-        # Generate other sections
-        skills_generator = SkillsGenerator(self.vacancy_text)
-        self.context.update(skills_generator.generate())
-        
-        summary_generator = SummaryGenerator(self.vacancy_text, self.role_descriptions)
-        self.context.update(summary_generator.generate())
-        
-        self_study_generator = SelfStudyGenerator(self.vacancy_text)
-        self.context.update(self_study_generator.generate())
+        # Role descriptions come first as other sections depend on them
+        for section in self.SECTIONS.values():
+            self._run_section(section)
+
+        if not render:
+            return True
         
-        self.render_template()
+        if self.render_template():
+            # Everything made it into the document, the journal is no longer needed
+            self.journal.clear()
+            self.completed_sections = {}
         return True
 
+    def _run_section(self, section):
+        """Generate a single section, or replay it from the journal when resuming."""
+        entry = self.completed_sections.pop(section, None)
+        if entry is not None:
+            print(f"\nReusing journaled {section} section...")
+            self.context.update(entry["context"])
+            self.section_timings[section] = entry.get("seconds", 0.0)
+            self.model_usage.extend(entry.get("model_usage", []))
+            if section == "roles":
+                self.role_descriptions = entry.get("role_descriptions", {})
+                self.selected_role_keywords = entry.get("selected_role_keywords", {})
+                self.job_keywords = entry.get("job_keywords", [])
+            return
+
+        started = time.perf_counter()
+        with tracer.span(section, "section"):
+            result, state = self._generate_section(section)
+
+        self.section_timings[section] = round(time.perf_counter() - started, 3)
+        self.context.update(result)
+        self.model_usage.extend(state["model_usage"])
+
+        # Fallback content is never journaled, so a resumed run retries the section
+        if state.pop("used_fallback"):
+            self.fallback_sections.append(section)
+            print(f"Not journaling the {section} section because it contains fallback content")
+            return
+        self.journal.record(section, result, seconds=self.section_timings[section], **state)
+
+    def _generate_section(self, section):
+        """Run the generator for a section and return its context and extra journal state."""
+        state = {}
+
+        if section == "roles":
+            print("\nGenerating cohesive role descriptions...")
+            generator = RoleGenerator(self.vacancy_text, self.default_info, self.roles_config,
+                                      model_config=self.model_config)
+            self.role_descriptions, self.selected_role_keywords = generator.generate()
+            self.job_keywords = generator.job_keywords
+            result = generator.context
+            state = {
+                "role_descriptions": self.role_descriptions,
+                "selected_role_keywords": self.selected_role_keywords,
+                "job_keywords": self.job_keywords,
+            }
+        elif section == "skills":
+            print("\nGenerating skills sections...")
+            generator = SkillsGenerator(self.vacancy_text, model_config=self.model_config)
+            result = generator.generate()
+        elif section == "summary":
+            print("\nGenerating professional summary...")
+            generator = SummaryGenerator(self.vacancy_text, self.role_descriptions, model_config=self.model_config)
+            result = generator.generate()
+        elif section == "self_study":
+            print("\nGenerating self-study entries...")
+            generator = SelfStudyGenerator(self.vacancy_text, model_config=self.model_config)
+            result = generator.generate()
+        else:
+            raise ValueError(f"Unknown CV section: {section}")
+
+        state["model_usage"] = generator.call_metrics
+        state["used_fallback"] = generator.used_fallback
+        return result, state
+
+    def keyword_coverage(self):
+        """Return the share of extracted job keywords that appear in the generated context."""
+        if not self.job_keywords:
+            return 0.0
+        text = " ".join(str(value) for value in self.context.values()).lower()
+        covered = [keyword for keyword in self.job_keywords if keyword.lower() in text]
+        return round(len(covered) / len(self.job_keywords), 3)
+
+    def print_model_usage(self):
+        """Print which model served each call and how long it took."""
+        print("\n=== Model Usage ===")
+        for metric in self.model_usage:
+            tokens = metric.get("prompt_tokens", 0) + metric.get("completion_tokens", 0)
+            print(f"{metric['section']}: {metric['model']} {metric['status']} "
+                  f"in {metric['seconds']:.2f}s ({tokens} tokens)")
+
+    def to_record(self):
+        """Return a compact, JSON serializable summary of this run."""
+        return {
+            "vacancy_hash": self.journal.vacancy_hash,
+            "vacancy_path": self.vacancy_text_path,
+            "context_keys": sorted(self.context),
+            "context": self.context,
+            "keyword_coverage": self.keyword_coverage(),
+            "timings": self.section_timings,
+            "ingestion": self.ingestion.report,
+            "models": self.model_usage,
+            "fallback_sections": self.fallback_sections,
+        }
+
     def render_template(self, output_docx_path="CV.docx", output_pdf_path="CV_final.pdf"):
         """Render the DOCX template and convert to PDF if needed."""
         try:
-            # Check if file is available for writing
-            while True:
-                try:
-                    with open(output_docx_path, 'w') as f:
-                        pass
-                    break
-                except IOError:
-                    print(f"\nThe file {output_docx_path} is currently in use.")
-                    print("Please close the file and press Enter to continue...")
-                    input()
-                    continue
-
-            # Create a modified context with appropriate styling for docxtpl
-            styled_context = {}
-            for key, value in self.context.items():
-                if isinstance(value, str) and "<BOLD>" in value:
-                    # Replace <BOLD> tags with docxtpl's rich text format
-                    styled_text = []
-                    parts = re.split(r'(<BOLD>.*?</BOLD>)', value)
-
-                    for part in parts:
-                        if part.startswith('<BOLD>') and part.endswith('</BOLD>'):
-                            # Extract text between tags
-                            bold_text = re.sub(r'<BOLD>(.*?)</BOLD>', r'\1', part)
-                            styled_text.append({'text': bold_text, 'bold': True})
-                        elif part:
-                            styled_text.append({'text': part})
-
-                    styled_context[key] = styled_text
+            self._wait_until_writable(output_docx_path)
+
+            with tracer.span("render", "section", template=self.template_path):
+                with tracer.span("template_compile", "render"):
+                    fast_template = self._load_fast_template() if self.fast_render else None
+                if fast_template is not None:
+                    # Splice the styled context straight into document.xml
+                    _render_fast(fast_template, self._build_styled_context(), output_docx_path)
                 else:
-                    styled_context[key] = value
-
-            # Render template with styled context
-            from docxtpl import DocxTemplate, RichText
-
-            doc = DocxTemplate(self.template_path)
-
-            # Convert styled_context entries to RichText objects
-            for key, value in styled_context.items():
-                if isinstance(value, list) and all(isinstance(item, dict) for item in value):
-                    rt = RichText()
-                    for item in value:
-                        if item.get('bold', False):
-                            rt.add(item['text'], bold=True)
-                        else:
-                            rt.add(item['text'])
-                    styled_context[key] = rt
-
-            doc.render(styled_context)
-            doc.save(output_docx_path)
+                    # Render template with styled context
+                    _render_docx(self.template_path, self._build_rich_context(), output_docx_path)
             print(f"CV successfully saved as {output_docx_path}")
+            return True
 
         except Exception as e:
             print(f"Error rendering template: {e}")
             import traceback
             traceback.print_exc()
+            return False
+
+    def render_templates(self, template_paths, output_dir=".", max_workers=None):
+        """Render the same context into several templates concurrently.
+
+        Templates the fast renderer can compile are spliced directly, the rest go
+        through docxtpl. The styled and RichText contexts are each built once and
+        shared by every render. Each output is named after its template, e.g.
+        CV_template_new.docx -> CV_new.docx, with the parent directory added when
+        two templates share a name.
+        """
+        styled_context = self._build_styled_context()
+        rich_context = None
+        trace_state = tracer.worker_state()
+        targets = {}
+        for template_path, output_name in _output_names_for_templates(template_paths).items():
+            output_docx_path = os.path.join(output_dir, output_name)
+            self._wait_until_writable(output_docx_path)
+            targets[template_path] = output_docx_path
+
+        rendered = {}
+        with tracer.span("render_templates", "render", count=len(targets)), ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for template_path, output_docx_path in targets.items():
+                fast_template = self._load_fast_template(template_path) if self.fast_render else None
+                if fast_template is not None:
+                    future = executor.submit(_traced_worker, trace_state, _render_fast,
+                                             fast_template, styled_context, output_docx_path)
+                else:
+                    if rich_context is None:
+                        rich_context = self._build_rich_context()
+                    future = executor.submit(_traced_worker, trace_state, _render_docx,
+                                             template_path, rich_context, output_docx_path)
+                futures[future] = template_path
+            for future in as_completed(futures):
+                template_path = futures[future]
+                try:
+                    rendered[template_path], events = future.result()
+                    tracer.merge(events)
+                    print(f"CV successfully saved as {rendered[template_path]} (from {template_path})")
+                except Exception as e:
+                    print(f"Error rendering template {template_path}: {e}")
+
+        return rendered
+
+    def _load_fast_template(self, template_path=None):
+        """Return the compiled fast-path template, or None if docxtpl is required."""
+        template_path = template_path or self.template_path
+        try:
+            return load_fast_template(template_path)
+        except ValueError as e:
+            print(f"Fast renderer cannot handle {template_path} ({e}), falling back to docxtpl")
+            return None
+
+    def _wait_until_writable(self, output_docx_path):
+        """Block until the output file can be opened for writing."""
+        while True:
+            try:
+                with open(output_docx_path, 'w') as f:
+                    pass
+                break
+            except IOError:
+                print(f"\nThe file {output_docx_path} is currently in use.")
+                print("Please close the file and press Enter to continue...")
+                input()
+                continue
+
+    def _build_styled_context(self):
+        """Split <BOLD> tagged values into lists of text runs with bold flags."""
+        styled_context = {}
+        for key, value in self.context.items():
+            if isinstance(value, str) and "<BOLD>" in value:
+                # Replace <BOLD> tags with docxtpl's rich text format
+                styled_text = []
+                parts = re.split(r'(<BOLD>.*?</BOLD>)', value)
+
+                for part in parts:
+                    if part.startswith('<BOLD>') and part.endswith('</BOLD>'):
+                        # Extract text between tags
+                        bold_text = re.sub(r'<BOLD>(.*?)</BOLD>', r'\1', part)
+                        styled_text.append({'text': bold_text, 'bold': True})
+                    elif part:
+                        styled_text.append({'text': part})
+
+                styled_context[key] = styled_text
+            else:
+                styled_context[key] = value
+        return styled_context
+
+    def _build_rich_context(self):
+        """Create a modified context with appropriate styling for docxtpl."""
+        from docxtpl import RichText
+
+        styled_context = self._build_styled_context()
+
+        # Convert styled_context entries to RichText objects
+        for key, value in styled_context.items():
+            if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+                rt = RichText()
+                for item in value:
+                    if item.get('bold', False):
+                        rt.add(item['text'], bold=True)
+                    else:
+                        rt.add(item['text'])
+                styled_context[key] = rt
+        return styled_context
 
     def generate_cv(self):
         """Generate CV content based on user selection."""
@@ -0,0 +1,73 @@
+import math
+import threading
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call is attempted after the run deadline has passed."""
+
+
+class RunDeadline:
+    def __init__(self):
+        """Initialize an overall wall-clock deadline shared by every call of a run."""
+        self.expires_at = None
+
+    def start(self, seconds):
+        """Start the deadline, or disable it when seconds is None."""
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self):
+        """Return the seconds left before the deadline, or None if there is none."""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def clip(self, timeout):
+        """Shorten a per-call timeout so it never runs past the run deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("run deadline exceeded")
+        return min(timeout, remaining) if timeout else remaining
+
+
+class LatencyHistory:
+    def __init__(self, min_samples=5, hedge_percentile=None, seed_fraction=0.5):
+        """Initialize a record of observed call latencies per section and model."""
+        self.min_samples = min_samples
+        # Until enough samples exist, hedge once this fraction of the section budget has passed
+        self.seed_fraction = seed_fraction
+        # Send a duplicate request once a call is slower than this percentile,
+        # None disables hedging
+        self.hedge_percentile = hedge_percentile
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, section, model, seconds):
+        """Add an observed latency."""
+        with self._lock:
+            self.samples.setdefault((section, model), []).append(seconds)
+
+    def percentile(self, section, model, percentile):
+        """Return the latency percentile, or None until enough samples exist."""
+        with self._lock:
+            samples = sorted(self.samples.get((section, model), []))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(percentile / 100 * len(samples)) - 1))
+        return samples[index]
+
+    def hedge_after(self, section, model, budget=None):
+        """Return how long to wait before hedging a call, or None to not hedge."""
+        if self.hedge_percentile is None:
+            return None
+        observed = self.percentile(section, model, self.hedge_percentile)
+        if observed is None and budget:
+            return budget * self.seed_fraction
+        return observed
+
+
+# Shared by every generator so deadlines and latency history span the whole run
+run_deadline = RunDeadline()
+latency_history = LatencyHistory()
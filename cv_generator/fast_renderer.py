@@ -0,0 +1,203 @@
+import html
+import os
+import re
+import shutil
+import zipfile
+from xml.sax.saxutils import escape
+
+DOCUMENT_PART = "word/document.xml"
+
+PARAGRAPH_PATTERN = re.compile(r'<w:p(?:\s[^>]*?)?(?<!/)>.*?</w:p>', re.DOTALL)
+RUN_PATTERN = re.compile(r'<w:r(?:\s[^>]*?)?(?<!/)>.*?</w:r>', re.DOTALL)
+RUN_PROPERTIES_PATTERN = re.compile(r'<w:rPr>.*?</w:rPr>|<w:rPr/>', re.DOTALL)
+TEXT_PATTERN = re.compile(r'<w:t(?:\s[^>]*?)?(?<!/)>(.*?)</w:t>|<w:t/>', re.DOTALL)
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+JINJA_TAG_PATTERN = re.compile(r'\{[%#]|[%#]\}')
+
+# Run children that carry no content and can be dropped when runs are merged
+IGNORABLE_RUN_CHILDREN = re.compile(r'<w:lastRenderedPageBreak/>|\s+')
+
+
+class FastDocxTemplate:
+    """Placeholder-only DOCX template compiled into static XML chunks and slots.
+
+    Rendering splices escaped text runs into word/document.xml and copies every
+    other zip member unchanged. Templates with loops, conditionals or expressions
+    raise ValueError at compile time so callers can fall back to docxtpl.
+    """
+
+    def __init__(self, template_path):
+        self.template_path = template_path
+        self.chunks = []
+        self._compile()
+
+    def _compile(self):
+        """Split the document XML into static chunks and (key, rPr) slots."""
+        with zipfile.ZipFile(self.template_path) as template:
+            for name in template.namelist():
+                if name.startswith("word/") and name.endswith(".xml") and name != DOCUMENT_PART:
+                    text = self._xml_text(template.read(name).decode("utf-8"))
+                    if "{{" in text or JINJA_TAG_PATTERN.search(text):
+                        raise ValueError(f"template tags found outside the document body in {name}")
+            document_xml = template.read(DOCUMENT_PART).decode("utf-8")
+
+        if JINJA_TAG_PATTERN.search(self._xml_text(document_xml)):
+            raise ValueError("template uses loops, conditionals or comments")
+
+        position = 0
+        for paragraph in PARAGRAPH_PATTERN.finditer(document_xml):
+            if "{{" not in self._xml_text(paragraph.group(0)):
+                continue
+            self.chunks.append(document_xml[position:paragraph.start()])
+            self.chunks.extend(self._compile_paragraph(paragraph.group(0)))
+            position = paragraph.end()
+        self.chunks.append(document_xml[position:])
+
+        # Merge adjacent static chunks so rendering is a single pass
+        merged = []
+        for chunk in self.chunks:
+            if isinstance(chunk, str) and merged and isinstance(merged[-1], str):
+                merged[-1] += chunk
+            else:
+                merged.append(chunk)
+        self.chunks = merged
+
+    def _compile_paragraph(self, paragraph_xml):
+        """Compile a paragraph containing placeholders, which Word may split across runs."""
+        if "<w:p " in paragraph_xml[1:] or "<w:p>" in paragraph_xml[1:]:
+            raise ValueError("placeholders inside nested paragraphs are not supported")
+
+        runs = []
+        text = ""
+        for run in RUN_PATTERN.finditer(paragraph_xml):
+            run_xml = run.group(0)
+            properties = RUN_PROPERTIES_PATTERN.search(run_xml)
+            run_text = "".join(html.unescape(t.group(1) or "") for t in TEXT_PATTERN.finditer(run_xml))
+            runs.append({
+                "start": run.start(),
+                "end": run.end(),
+                "xml": run_xml,
+                "rpr": properties.group(0) if properties else "",
+                "text_start": len(text),
+                "text_end": len(text) + len(run_text),
+            })
+            text += run_text
+
+        matches = list(PLACEHOLDER_PATTERN.finditer(text))
+        leftover = PLACEHOLDER_PATTERN.sub("", text)
+        if "{{" in leftover or "}}" in leftover:
+            raise ValueError(f"unsupported template expression in paragraph: {text.strip()}")
+
+        # Group the runs that hold placeholder text into contiguous blocks
+        touched = sorted({
+            index
+            for match in matches
+            for index, run in enumerate(runs)
+            if run["text_start"] < match.end() and run["text_end"] > match.start()
+        })
+        blocks = []
+        for index in touched:
+            if blocks and blocks[-1][-1] == index - 1:
+                blocks[-1].append(index)
+            else:
+                blocks.append([index])
+
+        chunks = []
+        position = 0
+        for block in blocks:
+            for index in block:
+                content = TEXT_PATTERN.sub("", RUN_PROPERTIES_PATTERN.sub("", runs[index]["xml"]))
+                content = re.sub(r'^<w:r(?:\s[^>]*)?>|</w:r>$', "", content)
+                if IGNORABLE_RUN_CHILDREN.sub("", content):
+                    raise ValueError("placeholder runs may only contain text")
+
+            first, last = runs[block[0]], runs[block[-1]]
+            chunks.append(paragraph_xml[position:first["start"]])
+            chunks.extend(self._compile_block(text, runs[block[0]:block[-1] + 1], matches))
+            position = last["end"]
+        chunks.append(paragraph_xml[position:])
+        return chunks
+
+    def _compile_block(self, text, runs, matches):
+        """Rebuild a block of runs as static text runs around placeholder slots."""
+        chunks = []
+        cursor = runs[0]["text_start"]
+        block_end = runs[-1]["text_end"]
+
+        for match in matches:
+            if match.start() < cursor or match.end() > block_end:
+                continue
+            chunks.extend(self._static_runs(text, runs, cursor, match.start()))
+            run = next(r for r in runs if r["text_start"] <= match.start() < r["text_end"])
+            chunks.append((match.group(1), run["rpr"]))
+            cursor = match.end()
+
+        chunks.extend(self._static_runs(text, runs, cursor, block_end))
+        return chunks
+
+    def _static_runs(self, text, runs, start, end):
+        """Emit plain text between start and end, keeping each run's own formatting."""
+        chunks = []
+        for run in runs:
+            piece_start = max(start, run["text_start"])
+            piece_end = min(end, run["text_end"])
+            if piece_start < piece_end:
+                chunks.append(_run_xml(run["rpr"], text[piece_start:piece_end]))
+        return chunks
+
+    @staticmethod
+    def _xml_text(xml):
+        """Return the visible text of an XML fragment."""
+        return html.unescape(re.sub(r'<[^>]+>', "", xml))
+
+    def render(self, styled_context, output_docx_path):
+        """Write the rendered document, streaming all other members through unchanged."""
+        with zipfile.ZipFile(self.template_path) as template, \
+                zipfile.ZipFile(output_docx_path, "w", zipfile.ZIP_DEFLATED) as output:
+            for info in template.infolist():
+                if info.filename == DOCUMENT_PART:
+                    with output.open(info, "w") as target:
+                        for chunk in self.chunks:
+                            if isinstance(chunk, str):
+                                target.write(chunk.encode("utf-8"))
+                            else:
+                                key, rpr = chunk
+                                target.write(_slot_xml(rpr, styled_context.get(key, "")).encode("utf-8"))
+                else:
+                    with template.open(info) as source, output.open(info, "w") as target:
+                        shutil.copyfileobj(source, target)
+
+
+def _run_xml(rpr, text, bold=False):
+    """Build a single text run."""
+    if bold:
+        rpr = _bold_properties(rpr)
+    return f'<w:r>{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _bold_properties(rpr):
+    """Add <w:b/> to run properties, after rStyle/rFonts as the schema order requires."""
+    if not rpr or rpr == "<w:rPr/>":
+        return "<w:rPr><w:b/></w:rPr>"
+    if re.search(r'<w:b(?:\s[^>]*)?/>', rpr):
+        return rpr
+    anchor = re.match(r'<w:rPr>(?:<w:rStyle[^>]*/>)?(?:<w:rFonts[^>]*/>)?', rpr)
+    return rpr[:anchor.end()] + "<w:b/>" + rpr[anchor.end():]
+
+
+def _slot_xml(rpr, value):
+    """Render a context value, either plain text or a list of styled parts, as runs."""
+    if isinstance(value, list):
+        return "".join(_run_xml(rpr, item["text"], item.get("bold", False)) for item in value)
+    return _run_xml(rpr, "" if value is None else str(value))
+
+
+_compiled_templates = {}
+
+
+def load_fast_template(template_path):
+    """Return a compiled template, compiling it only once per file version."""
+    key = (os.path.abspath(template_path), os.path.getmtime(template_path))
+    if key not in _compiled_templates:
+        _compiled_templates[key] = FastDocxTemplate(template_path)
+    return _compiled_templates[key]
@@ -1,16 +1,20 @@
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from ..base_generator import BaseGenerator
+from ..tracing import tracer
 
 
 class RoleGenerator(BaseGenerator):
-    def __init__(self, vacancy_text, default_info, roles_config, api_key=None):
-        super().__init__(api_key)
+    def __init__(self, vacancy_text, default_info, roles_config, api_key=None, model_config=None):
+        super().__init__(api_key, model_config)
         self.vacancy_text = vacancy_text
         self.default_info = default_info
         self.roles_config = roles_config
         self.role_descriptions = {}
         self.selected_role_keywords = {}
+        # Messages of roles generated in parallel, printed per role once all have finished
+        self.role_logs = {}
         self.job_keywords = self._extract_job_keywords()
 
     def _extract_job_keywords(self):
@@ -37,17 +41,24 @@ class RoleGenerator(BaseGenerator):
         ]
 
         try:
-            response = self.client.chat.completions.create(
-                messages=messages,
-                model="gpt-4o",
-                response_format={"type": "json_object"},
-                temperature=0.2
-            )
+            with tracer.span("keyword_extraction", "llm"):
+                response = self._create_completion(
+                    "keywords",
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=0.2
+                )
             result = json.loads(response.choices[0].message.content)
             # For backward compatibility, we'll continue using job_keywords
-            return result.get("technical_keywords", [])
+            keywords = []
+            for keyword in result.get("technical_keywords", []):
+                # Drop repeated keywords, keeping the first (most important) occurrence
+                if keyword.lower() not in [k.lower() for k in keywords]:
+                    keywords.append(keyword)
+            return keywords
         except Exception as e:
             print(f"Error extracting job keywords: {e}")
+            self.used_fallback = True
             return []
 
     def _create_role_context(self):
@@ -64,9 +75,8 @@ class RoleGenerator(BaseGenerator):
         }
 
         for role, config in self.roles_config.items():
-            default_info = [desc.strip() for desc in self.default_info.get(role, '').split(',') if desc.strip()]
             career_context += f"{role} ({seniority_mapping[role]}):\n"
-            for desc in default_info:
+            for desc in self.default_info.get(role, []):
                 career_context += f"- {desc}\n"
             career_context += "\n"
         return career_context
@@ -74,62 +84,100 @@ class RoleGenerator(BaseGenerator):
     def generate(self):
         """Generate role descriptions with awareness of the entire career progression."""
         career_context = self._create_role_context()
-        processed_keywords = set()
         ordered_roles = ["WOUFF", "APPSIDE", "WHIMSY", "GALAXY", "LUCID"]
-        attempts_per_role = {}  # Track how many attempts per role
+
+        # Keywords are planned up front so every role can be generated at once
+        self.selected_role_keywords = self._plan_keywords(ordered_roles)
+
+        self.role_logs = {role: [] for role in ordered_roles}
+        with ThreadPoolExecutor(max_workers=len(ordered_roles)) as executor:
+            list(executor.map(lambda role: self._generate_role(role, career_context), ordered_roles))
 
         for role in ordered_roles:
-            attempts_per_role[role] = 0
-            config = self.roles_config[role]
-            role_description = self.default_info.get(role, "")
-            count = config["count"]
-            half_count = max(1, count // 2)
+            print(f"\n--- {role} ---")
+            for message in self.role_logs[role]:
+                print(message)
+
+        # Keep the career order regardless of which role finished first
+        self.role_descriptions = {role: self.role_descriptions.get(role, []) for role in ordered_roles}
+        for role, descriptions in self.role_descriptions.items():
+            # Store descriptions in context with proper template tags
+            for i, desc in enumerate(descriptions):
+                self.context[f"ROLE_DESCRIPTION_{role}_{i}"] = desc
+
+        self._check_keyword_coverage()
+        return self.role_descriptions, self.selected_role_keywords
+
+    def _plan_keywords(self, ordered_roles, max_keywords=5, keywords_per_bullet=2):
+        """Assign job keywords to roles before any descriptions are generated.
+
+        Senior roles always feature the most important keywords. The other roles
+        take consecutive, non-overlapping slices in career order so that together
+        they cover as much of the job description as possible, wrapping around to
+        the top keywords once the list runs out. Slice size follows the role's
+        bullet count.
+        """
+        # The model can repeat a keyword, which must not be planned twice
+        keywords = list(dict.fromkeys(self.job_keywords))
+        plan = {}
+        position = 0
+
+        for role in ordered_roles:
+            size = min(max_keywords, keywords_per_bullet * self.roles_config[role]["count"], len(keywords))
 
-            # Select priority keywords for this role
             if role in ["GALAXY", "LUCID"]:
-                priority_keywords = self.job_keywords[:5]
-            else:
-                available_keywords = [k for k in self.job_keywords if k.lower() not in processed_keywords]
-                if len(available_keywords) < 5:
-                    additional_keywords = self.job_keywords[:5]
-                    priority_keywords = list(set(available_keywords + additional_keywords))[:5]
-                else:
-                    priority_keywords = available_keywords[:5]
+                plan[role] = keywords[:size]
+                continue
+
+            plan[role] = [keywords[(position + i) % len(keywords)] for i in range(size)]
+            position += size
 
-            self.selected_role_keywords[role] = priority_keywords
+        return plan
 
-            # Generate description with retry logic
+    def _generate_role(self, role, career_context):
+        """Generate descriptions for one role, retrying until enough bullet points exist."""
+        config = self.roles_config[role]
+        role_description = "\n".join(self.default_info.get(role, []))
+        count = config["count"]
+        half_count = max(1, count // 2)
+        priority_keywords = self.selected_role_keywords[role]
+
+        # Generate description with retry logic
+        with tracer.span(f"role:{role}", "llm", attempt=0, temperature=0.7):
             self._generate_role_description(role, career_context, role_description,
                                             count, half_count, priority_keywords)
 
-            # If no valid descriptions were generated, retry with different temperature
-            max_attempts = 3
-            while (role not in self.role_descriptions or not self.role_descriptions[role] or
-                   len(self.role_descriptions[role]) < count) and attempts_per_role[role] < max_attempts:
-                attempts_per_role[role] += 1
-                print(f"Retrying generation for {role} (attempt {attempts_per_role[role]})")
+        # If no valid descriptions were generated, retry with different temperature
+        max_attempts = 3
+        attempts = 0
+        while (role not in self.role_descriptions or not self.role_descriptions[role] or
+               len(self.role_descriptions[role]) < count) and attempts < max_attempts:
+            attempts += 1
+            self._log_role(role, f"Retrying generation for {role} (attempt {attempts})")
 
-                # Adjust temperature and top keyword selection based on attempt number
-                temperature = 0.7 + (attempts_per_role[role] * 0.1)  # Increase randomness
-                keyword_count = 5 + attempts_per_role[role]  # Use more keywords
-                retry_keywords = self.job_keywords[:keyword_count]
+            # Adjust temperature and add more of the planned and top keywords on each attempt
+            temperature = 0.7 + (attempts * 0.1)  # Increase randomness
+            retry_keywords = list(dict.fromkeys(priority_keywords + self.job_keywords[:5 + attempts]))
 
+            with tracer.span(f"role:{role}", "llm", attempt=attempts, temperature=temperature):
                 self._generate_role_description(role, career_context, role_description,
                                                 count, half_count, retry_keywords,
                                                 temperature=temperature)
 
-            # Store descriptions in context with proper template tags
-            descriptions = self.role_descriptions.get(role, [])
-            for i, desc in enumerate(descriptions):
-                self.context[f"ROLE_DESCRIPTION_{role}_{i}"] = desc
+    def _log_role(self, role, message):
+        """Keep a message about one role to print once every role has finished."""
+        self.role_logs.setdefault(role, []).append(message)
 
-            # Update processed keywords
-            for point in self.role_descriptions.get(role, []):
-                for keyword in self.job_keywords:
-                    if keyword.lower() in point.lower():
-                        processed_keywords.add(keyword.lower())
+    def _check_keyword_coverage(self):
+        """Report which job keywords made it into the generated descriptions."""
+        text = " ".join(desc for descriptions in self.role_descriptions.values() for desc in descriptions).lower()
+        covered = [keyword for keyword in self.job_keywords if keyword.lower() in text]
+        missing = [keyword for keyword in self.job_keywords if keyword.lower() not in text]
 
-        return self.role_descriptions, self.selected_role_keywords
+        print(f"Keyword coverage: {len(covered)}/{len(self.job_keywords)} job keywords used in role descriptions")
+        if missing:
+            print(f"Missing keywords: {', '.join(missing)}")
+        return covered, missing
 
     def _generate_role_description(self, role, career_context, role_description,
                                    count, half_count, priority_keywords, temperature=0.7):
@@ -206,10 +254,10 @@ class RoleGenerator(BaseGenerator):
         ]
 
         try:
-            print(f"Generating descriptions for {role} with temperature {temperature}")
-            response = self.client.chat.completions.create(
+            self._log_role(role, f"Generating descriptions for {role} with temperature {temperature}")
+            response = self._create_completion(
+                "roles",
                 messages=messages,
-                model="gpt-4o",
                 temperature=temperature
             )
 
@@ -227,16 +275,17 @@ class RoleGenerator(BaseGenerator):
 
             # Log success or issues
             if not bullet_points:
-                print(f"WARNING: No valid bullet points generated for {role}")
-                print(f"Raw response: {response.choices[0].message.content[:200]}...")
+                self._log_role(role, f"WARNING: No valid bullet points generated for {role}")
+                self._log_role(role, f"Raw response: {response.choices[0].message.content[:200]}...")
             else:
-                print(f"Successfully generated {len(bullet_points)} points for {role}")
+                self._log_role(role, f"Successfully generated {len(bullet_points)} points for {role}")
 
         except Exception as e:
-            print(f"Error generating descriptions for {role}: {e}")
-            # Only set default error message if no descriptions exist yet
+            self._log_role(role, f"Error generating descriptions for {role}: {e}")
+            self.used_fallback = True
+            # Only fall back to the role's default bullet points if no descriptions exist yet
             if role not in self.role_descriptions or not self.role_descriptions[role]:
-                self.role_descriptions[role] = ["Error generating description"] * count
+                self.role_descriptions[role] = self.default_info.get(role, [])[:count]
 
     def _process_response(self, response, role):
         """Process the response to get clean bullet points with proper formatting."""
@@ -244,7 +293,7 @@ class RoleGenerator(BaseGenerator):
         raw_text = response.choices[0].message.content
 
         # Log the raw response for debugging
-        print(f"Raw response for {role} (first 100 chars): {raw_text[:100]}...")
+        self._log_role(role, f"Raw response for {role} (first 100 chars): {raw_text[:100]}...")
 
         # Split by line breaks and clean up
         lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
@@ -317,13 +366,13 @@ class RoleGenerator(BaseGenerator):
             bullet_points.append(line)
 
         # Log results for debugging
-        print(f"Found {len(valid_lines)} valid lines for {role}")
+        self._log_role(role, f"Found {len(valid_lines)} valid lines for {role}")
         if rejected_lines:
-            print(f"Rejected {len(rejected_lines)} lines for {role}")
+            self._log_role(role, f"Rejected {len(rejected_lines)} lines for {role}")
 
         # If all lines were filtered out but we have original content, make a best effort
         if not bullet_points and lines:
-            print(f"All lines were filtered out for {role}, attempting to recover...")
+            self._log_role(role, f"All lines were filtered out for {role}, attempting to recover...")
             # Take the longest lines as a fallback
             lines.sort(key=len, reverse=True)
             bullet_points = [line.strip() for line in lines[:5] if len(line) > 15]
@@ -1,8 +1,9 @@
 from ..base_generator import BaseGenerator
+from ..tracing import tracer
 
 class SelfStudyGenerator(BaseGenerator):
-    def __init__(self, vacancy_text, api_key=None):
-        super().__init__(api_key)
+    def __init__(self, vacancy_text, api_key=None, model_config=None):
+        super().__init__(api_key, model_config)
         self.vacancy_text = vacancy_text
 
     def generate(self):
@@ -22,14 +23,15 @@ class SelfStudyGenerator(BaseGenerator):
         """
 
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You create concise, technical self-study entries for CVs."},
-                    {"role": "user", "content": f"{self_study_prompt}\n\nJob Description:\n{self.vacancy_text}"}
-                ],
-                model="gpt-4o",
-                temperature=0.7
-            )
+            with tracer.span("self_study:completion", "llm"):
+                response = self._create_completion(
+                    "self_study",
+                    messages=[
+                        {"role": "system", "content": "You create concise, technical self-study entries for CVs."},
+                        {"role": "user", "content": f"{self_study_prompt}\n\nJob Description:\n{self.vacancy_text}"}
+                    ],
+                    temperature=0.7
+                )
 
             entries = self._process_response(response)
             
@@ -39,11 +41,13 @@ class SelfStudyGenerator(BaseGenerator):
                 self.context["SELF_STUDY_1"] = entries[1]
             else:
                 # Fallback entries if generation fails
+                self.used_fallback = True
                 self.context["SELF_STUDY_0"] = "Developed multiplayer game prototype using Unity Netcode for GameObjects and Unity Transport"
                 self.context["SELF_STUDY_1"] = "Implemented server-authoritative architecture with client-side prediction and lag compensation"
 
         except Exception as e:
             print(f"Error generating self-study entries: {e}")
+            self.used_fallback = True
             # Fallback entries
             self.context["SELF_STUDY_0"] = "Developed multiplayer game prototype using Unity Netcode for GameObjects and Unity Transport"
             self.context["SELF_STUDY_1"] = "Implemented server-authoritative architecture with client-side prediction and lag compensation"
@@ -1,8 +1,9 @@
 from ..base_generator import BaseGenerator
+from ..tracing import tracer
 
 class SkillsGenerator(BaseGenerator):
-    def __init__(self, vacancy_text, api_key=None):
-        super().__init__(api_key)
+    def __init__(self, vacancy_text, api_key=None, model_config=None):
+        super().__init__(api_key, model_config)
         self.vacancy_text = vacancy_text
 
     def generate(self):
@@ -24,17 +25,19 @@ class SkillsGenerator(BaseGenerator):
         )
 
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You identify only the most critical skills for technical resumes."},
-                    {"role": "user", "content": prompt}
-                ],
-                model="gpt-4o",
-                temperature=0.2
-            )
+            with tracer.span("skills:programming", "llm"):
+                response = self._create_completion(
+                    "skills",
+                    messages=[
+                        {"role": "system", "content": "You identify only the most critical skills for technical resumes."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.2
+                )
             self.context["ROLE_SKILLS_PROGRAMMING"] = response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error generating programming skills: {e}")
+            self.used_fallback = True
             self.context["ROLE_SKILLS_PROGRAMMING"] = "C#, Unity, Multiplayer frameworks, UniTask, SOLID principles"
 
     def generate_technical_skills(self):
@@ -49,17 +52,19 @@ class SkillsGenerator(BaseGenerator):
         )
 
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You identify only the most critical technical skills for IT resumes."},
-                    {"role": "user", "content": prompt}
-                ],
-                model="gpt-4o",
-                temperature=0.2
-            )
+            with tracer.span("skills:technical", "llm"):
+                response = self._create_completion(
+                    "skills",
+                    messages=[
+                        {"role": "system", "content": "You identify only the most critical technical skills for IT resumes."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.2
+                )
             self.context["ROLE_SKILLS_TECHNICAL"] = response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error generating technical skills: {e}")
+            self.used_fallback = True
             self.context["ROLE_SKILLS_TECHNICAL"] = "Server-authoritative architecture, Dependency injection (VContainer), Performance optimization"
 
     def generate_soft_skills(self):
@@ -73,15 +78,17 @@ class SkillsGenerator(BaseGenerator):
         )
 
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You identify only the most critical soft skills for professional resumes."},
-                    {"role": "user", "content": prompt}
-                ],
-                model="gpt-4o",
-                temperature=0.2
-            )
+            with tracer.span("skills:soft", "llm"):
+                response = self._create_completion(
+                    "skills",
+                    messages=[
+                        {"role": "system", "content": "You identify only the most critical soft skills for professional resumes."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.2
+                )
             self.context["ROLE_SKILLS_SOFT"] = response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error generating soft skills: {e}")
+            self.used_fallback = True
             self.context["ROLE_SKILLS_SOFT"] = "Collaboration, Problem-Solving, Attention to Detail, Time Management, Adaptability" 
\ No newline at end of file
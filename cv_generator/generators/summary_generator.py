@@ -1,9 +1,10 @@
 from ..base_generator import BaseGenerator
+from ..tracing import tracer
 
 
 class SummaryGenerator(BaseGenerator):
-    def __init__(self, vacancy_text, role_descriptions, api_key=None):
-        super().__init__(api_key)
+    def __init__(self, vacancy_text, role_descriptions, api_key=None, model_config=None):
+        super().__init__(api_key, model_config)
         self.vacancy_text = vacancy_text
         self.role_descriptions = role_descriptions
 
@@ -48,18 +49,20 @@ class SummaryGenerator(BaseGenerator):
         formatted_prompt = summary_prompt.format(cv_text=all_text, job_text=self.vacancy_text)
 
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system",
-                     "content": "You create powerful, professional executive summaries that emphasize career identity and value proposition without specific metrics."},
-                    {"role": "user", "content": formatted_prompt}
-                ],
-                model="gpt-4o",
-                temperature=0.6
-            )
+            with tracer.span("summary:completion", "llm"):
+                response = self._create_completion(
+                    "summary",
+                    messages=[
+                        {"role": "system",
+                         "content": "You create powerful, professional executive summaries that emphasize career identity and value proposition without specific metrics."},
+                        {"role": "user", "content": formatted_prompt}
+                    ],
+                    temperature=0.6
+                )
             self.context["ROLE_SUMMARY"] = response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error generating professional summary: {e}")
+            self.used_fallback = True
             self.context[
                 "ROLE_SUMMARY"] = "Innovative Unity Developer recognized for crafting high-performance multiplayer experiences and elegant technical solutions. Adept at translating complex requirements into cohesive architecture while mentoring teams toward technical excellence. Committed to creating engaging player experiences through creative problem-solving and meticulous optimization"
 
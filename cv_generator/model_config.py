@@ -0,0 +1,12 @@
+# Per-section model tiers. Models are tried in order: a call that misses its
+# latency budget (in seconds) escalates to the next, larger model, and the last
+# model's failure falls through to the generator's built-in fallback content.
+SECTION_MODELS = {
+    "keywords": {"models": ["gpt-4o-mini", "gpt-4o"], "budget": 20},
+    "roles": {"models": ["gpt-4o"], "budget": 60},
+    "skills": {"models": ["gpt-4o-mini", "gpt-4o"], "budget": 15},
+    "summary": {"models": ["gpt-4o"], "budget": 45},
+    "self_study": {"models": ["gpt-4o-mini", "gpt-4o"], "budget": 20},
+}
+
+DEFAULT_MODEL_TIER = {"models": ["gpt-4o"], "budget": 60}
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+
+
+class RunJournal:
+    def __init__(self, path="cv_run_journal.jsonl", vacancy_text="", vacancy_hash=None):
+        """Initialize an append-only journal of completed section results."""
+        self.path = path
+        self.vacancy_hash = vacancy_hash or self.hash_vacancy(vacancy_text)
+
+    @staticmethod
+    def hash_vacancy(vacancy_text):
+        """Return a short stable hash identifying a vacancy description."""
+        return hashlib.sha256((vacancy_text or "").encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def hash_file(path, chunk_size=64 * 1024):
+        """Return a short stable hash of a posting file exactly as it is stored on disk."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()[:16]
+
+    def record(self, section, context, **state):
+        """Append a completed section result and flush it to disk immediately."""
+        entry = {
+            "vacancy_hash": self.vacancy_hash,
+            "section": section,
+            "context": context,
+        }
+        entry.update(state)
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def replay(self):
+        """Return the latest journaled result per section for the current vacancy."""
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated last line
+                    print(f"Warning: Skipping unreadable journal line in {self.path}")
+                    continue
+                if entry.get("vacancy_hash") == self.vacancy_hash:
+                    completed[entry["section"]] = entry
+
+        return completed
+
+    def clear(self):
+        """Drop this vacancy's entries, keeping any other vacancy's journaled sections."""
+        if not os.path.exists(self.path):
+            return
+
+        kept = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("vacancy_hash") != self.vacancy_hash:
+                    kept.append(line)
+
+        if not kept:
+            os.remove(self.path)
+            return
+
+        # Write a complete copy first so a crash never leaves a half-written journal
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.writelines(kept)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Which sections have to finish before another one can start
+SECTION_DEPENDENCIES = {
+    "roles": [],
+    "skills": [],
+    "summary": ["roles"],
+    "self_study": [],
+    "render": ["roles", "skills", "summary", "self_study"],
+}
+
+
+class Tracer:
+    def __init__(self):
+        """Initialize a span recorder that exports Chrome trace-event JSON."""
+        self.enabled = False
+        self.events = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, category="phase", **args):
+        """Record the wall time of the enclosed block as a complete trace event."""
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((started - self._origin) * 1e6),
+                "dur": round((finished - started) * 1e6),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def worker_state(self):
+        """Return what a worker process needs to record spans on the same timeline."""
+        return self.enabled, self._origin
+
+    def start_worker(self, state):
+        """Reset a worker process's tracer to record only its own spans."""
+        self.enabled, self._origin = state
+        with self._lock:
+            self.events = []
+
+    def merge(self, events):
+        """Add spans recorded in another process."""
+        with self._lock:
+            self.events.extend(events)
+
+    def export(self, path="cv_trace.json"):
+        """Write the recorded spans as a trace file viewable in Perfetto or chrome://tracing."""
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"Trace with {len(events)} spans saved as {path}")
+
+    def section_durations(self):
+        """Return the total seconds spent in each section span."""
+        durations = {}
+        with self._lock:
+            for event in self.events:
+                if event["cat"] == "section":
+                    durations[event["name"]] = durations.get(event["name"], 0.0) + event["dur"] / 1e6
+        return durations
+
+    def critical_path(self, dependencies=SECTION_DEPENDENCIES):
+        """Return the longest chain of dependent sections and its total duration."""
+        durations = self.section_durations()
+        finish = {}
+        previous = {}
+
+        # Dependencies are listed in a valid execution order
+        for section, requires in dependencies.items():
+            start = 0.0
+            previous[section] = None
+            for dependency in requires:
+                if finish[dependency] > start:
+                    start = finish[dependency]
+                    previous[section] = dependency
+            finish[section] = start + durations.get(section, 0.0)
+
+        if not finish:
+            return [], 0.0
+
+        section = max(finish, key=finish.get)
+        total = finish[section]
+        path = []
+        while section is not None:
+            path.append(section)
+            section = previous[section]
+        path.reverse()
+        return path, total
+
+    def print_critical_path(self):
+        """Print the critical path through the section dependency graph."""
+        durations = self.section_durations()
+        path, total = self.critical_path()
+        if not durations:
+            print("No section spans were recorded")
+            return
+
+        steps = " -> ".join(f"{section} ({durations.get(section, 0.0):.2f}s)" for section in path)
+        print("\n=== Critical Path ===")
+        print(f"{steps} = {total:.2f}s of {sum(durations.values()):.2f}s spent in sections")
+
+
+# Shared tracer used by every generator, disabled unless a trace is requested
+tracer = Tracer()
@@ -0,0 +1,244 @@
+import os
+import re
+from html.parser import HTMLParser
+from .run_journal import RunJournal
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    from pypdf import PdfReader
+    from pypdf.errors import PyPdfError
+except ImportError:
+    PdfReader = None
+    PyPdfError = None
+
+CHUNK_SIZE = 64 * 1024
+
+# Sections that rarely help tailor a CV; skipped until the next other heading.
+# Headings are matched as whole phrases so a bullet such as "Privacy-by-design mindset" is kept
+BOILERPLATE_HEADINGS = re.compile(
+    r'^(?:what we offer|our offer|benefits(?: (?:and|&) perks)?|perks(?: (?:and|&) benefits)?|'
+    r'compensation(?: and| &) benefits|why (?:join|work (?:with|for|at)) [\w&\'.-]+(?: [\w&\'.-]+)?|'
+    r'equal (?:opportunity|employment)(?: employer)?|eeo|diversity(?: and| &)? inclusion|accommodations?|'
+    r'privacy(?: notice| policy)?|cookies?(?: policy| settings)?|how to apply|application process|'
+    r'share this job|similar jobs|related jobs|apply now)[\s:.!?]*$',
+    re.IGNORECASE
+)
+# Headings that end a skipped section even when written as a plain sentence
+RELEVANT_HEADINGS = re.compile(
+    r'^(?:responsibilities|requirements|qualifications|what you(?:\'ll| will) do|what you(?:\'ll| will) bring|'
+    r'about(?: (?:the|this) (?:role|job|position|team)| you| us)?|the role|your role|skills|nice to have|'
+    r'bonus points|tech(?:nical)? stack|must have|key responsibilities|who you are|'
+    r'what we(?:\'re| are) looking for)[\s:.!?]*$',
+    re.IGNORECASE
+)
+# Single lines that are boilerplate wherever they appear
+BOILERPLATE_LINES = re.compile(
+    r'\b(?:we use cookies|accept (?:all )?cookies|cookie settings|by clicking|equal opportunity employer|'
+    r'without regard to (?:race|age|religion)|reasonable accommodations?|all rights reserved|'
+    r'sign in to|create (?:a )?job alert|report this job|share icon|apply for this (?:job|position|role))\b',
+    re.IGNORECASE
+)
+BULLET_MARKER = re.compile(r'^(?:[-*•·–—▪◦]|\d{1,2}[.)])\s')
+# Words left in lower case by title-cased headings
+MINOR_WORDS = {"a", "an", "and", "at", "by", "for", "in", "of", "on", "or", "the", "to", "we", "with", "you", "&"}
+MARKUP_SNIFF = re.compile(r'<(?:!doctype|html|head|body|div)\b', re.IGNORECASE)
+
+SKIPPED_HTML_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "svg", "form", "button", "iframe"}
+HEADING_HTML_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+BLOCK_HTML_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+    "section", "article", "tr", "table", "blockquote",
+}
+
+
+def count_tokens(text):
+    """Count tokens with tiktoken when available, otherwise estimate from length."""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    return max(1, len(text) // 4)
+
+
+def looks_like_heading(line):
+    """Return whether a plain-text line is shaped like a section heading rather than content."""
+    if len(line) > 60 or BULLET_MARKER.match(line):
+        return False
+    if line.endswith(":") or line.isupper():
+        return True
+    words = [word for word in line.split() if word[0].isalpha()]
+    return bool(words) and all(word[0].isupper() or word.lower() in MINOR_WORDS for word in words)
+
+
+class _VacancyHTMLParser(HTMLParser):
+    def __init__(self):
+        """Initialize a parser that collects visible text as lines."""
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self._current = []
+        self._skip_depth = 0
+        self._in_heading = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_HTML_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_HTML_TAGS:
+            self._break_line()
+            if tag in HEADING_HTML_TAGS:
+                self._in_heading = True
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_HTML_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_HTML_TAGS:
+            self._break_line()
+            if tag in HEADING_HTML_TAGS:
+                self._in_heading = False
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._current.append(data)
+
+    def _break_line(self):
+        line = " ".join("".join(self._current).split())
+        if line:
+            self.lines.append((line, self._in_heading))
+        self._current = []
+
+    def pop_lines(self):
+        """Return the lines completed so far, each with whether it was a heading tag."""
+        lines, self.lines = self.lines, []
+        return lines
+
+    def close(self):
+        super().close()
+        self._break_line()
+
+
+class VacancyIngestion:
+    def __init__(self, token_budget=4000):
+        """Initialize an ingestion stage that cleans postings and enforces a token budget."""
+        self.token_budget = token_budget
+        self.report = {}
+        self.text = ""
+        # Hash of the raw posting file, which unlike the cleaned text does not depend on the budget
+        self.source_hash = None
+
+    def ingest(self, path):
+        """Read a posting and return its cleaned text, recording what was removed."""
+        self.source_hash = RunJournal.hash_file(path)
+        self.report = {
+            "raw_tokens": 0,
+            "markup_tokens": 0,
+            "boilerplate_tokens": 0,
+            "duplicate_tokens": 0,
+            "budget_tokens": 0,
+            "kept_tokens": 0,
+        }
+        kept = []
+        seen = set()
+        skipping = False
+        over_budget = False
+
+        for line, heading_tag in self._read_lines(path):
+            tokens = count_tokens(line)
+            heading = heading_tag or looks_like_heading(line)
+
+            if heading and BOILERPLATE_HEADINGS.match(line):
+                skipping = True
+            elif heading or RELEVANT_HEADINGS.match(line):
+                # Any other heading ends a skipped section, so content under unlisted headings is kept
+                skipping = False
+
+            if skipping or BOILERPLATE_LINES.search(line):
+                self.report["boilerplate_tokens"] += tokens
+                continue
+
+            key = " ".join(line.lower().split())
+            if key in seen:
+                self.report["duplicate_tokens"] += tokens
+                continue
+            seen.add(key)
+
+            # Keep the posting in order, so everything after the first line that does not fit is dropped
+            if over_budget or (self.token_budget and self.report["kept_tokens"] + tokens > self.token_budget):
+                over_budget = True
+                self.report["budget_tokens"] += tokens
+                continue
+
+            kept.append(line)
+            self.report["kept_tokens"] += tokens
+
+        visible_tokens = (self.report["boilerplate_tokens"] + self.report["duplicate_tokens"] +
+                          self.report["budget_tokens"] + self.report["kept_tokens"])
+        self.report["markup_tokens"] = max(0, self.report["raw_tokens"] - visible_tokens)
+        self.report["removed_tokens"] = self.report["raw_tokens"] - self.report["kept_tokens"]
+        self.text = "\n".join(kept)
+        return self.text
+
+    def _read_lines(self, path):
+        """Yield (line, is_heading_tag) pairs, picking a reader from the extension and content."""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".pdf":
+            yield from self._read_pdf_lines(path)
+        elif extension in (".html", ".htm") or self._looks_like_markup(path):
+            yield from self._read_html_lines(path)
+        else:
+            yield from self._read_text_lines(path)
+
+    def _looks_like_markup(self, path):
+        """Return whether a posting saved with a text extension actually contains HTML."""
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            head = f.read(CHUNK_SIZE)
+        return head.lstrip().startswith("<") or bool(MARKUP_SNIFF.search(head))
+
+    def _read_text_lines(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                # Whitespace is not markup, so count tokens of the collapsed line
+                line = " ".join(line.split())
+                if line:
+                    self.report["raw_tokens"] += count_tokens(line)
+                    yield line, False
+
+    def _read_html_lines(self, path):
+        parser = _VacancyHTMLParser()
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.report["raw_tokens"] += count_tokens(chunk)
+                parser.feed(chunk)
+                yield from parser.pop_lines()
+        parser.close()
+        yield from parser.pop_lines()
+
+    def _read_pdf_lines(self, path):
+        if PdfReader is None:
+            raise ValueError("Reading PDF postings requires pypdf. Install it with 'pip install pypdf'.")
+
+        try:
+            pages = PdfReader(path).pages
+        except PyPdfError as e:
+            raise ValueError(f"{path} is not a readable PDF: {e}") from e
+
+        for page in pages:
+            text = page.extract_text() or ""
+            for line in text.splitlines():
+                line = " ".join(line.split())
+                if line:
+                    self.report["raw_tokens"] += count_tokens(line)
+                    yield line, False
+
+    def print_report(self):
+        """Print how many tokens were removed and why."""
+        report = self.report
+        print(f"Vacancy ingestion: {report['raw_tokens']} -> {report['kept_tokens']} tokens "
+              f"(removed {report['removed_tokens']}: markup {report['markup_tokens']}, "
+              f"boilerplate {report['boilerplate_tokens']}, duplicates {report['duplicate_tokens']}, "
+              f"over budget {report['budget_tokens']})")
@@ -1,8 +1,62 @@
 from cv_generator.cv_generator import CVGenerator
+from cv_generator.batch import run_batch, render_from_results
+from cv_generator.tracing import tracer
+from cv_generator.deadlines import latency_history
 from dotenv import load_dotenv
+import argparse
 import os
 
+def percentile(value):
+    """Parse a latency percentile, which must lie in (0, 100]."""
+    value = float(value)
+    if not 0 < value <= 100:
+        raise argparse.ArgumentTypeError(f"{value} is not a percentile between 0 (exclusive) and 100")
+    return value
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a CV tailored to a vacancy description.")
+    parser.add_argument("--vacancy", default="vacancy_description.txt", metavar="VACANCY_FILE",
+                        help="Vacancy description to tailor the CV to, as text, HTML or PDF")
+    parser.add_argument("--resume", action="store_true",
+                        help="Replay the run journal and only generate sections that are missing")
+    parser.add_argument("--journal", default="cv_run_journal.jsonl",
+                        help="Path of the append-only journal of completed sections")
+    parser.add_argument("--templates", nargs="+", default=[],
+                        help="Also render the generated content into these templates, in parallel")
+    parser.add_argument("--batch", nargs="+", metavar="VACANCY_FILE",
+                        help="Generate CV content for several postings without rendering")
+    parser.add_argument("--results", default="cv_results.jsonl",
+                        help="JSONL file that batch runs stream one record per posting into")
+    parser.add_argument("--render-from", metavar="RESULTS_FILE",
+                        help="Render DOCX files from a batch results JSONL file and exit")
+    parser.add_argument("--pdf", action="store_true",
+                        help="Also convert CVs rendered with --render-from to PDF")
+    parser.add_argument("--trace", metavar="TRACE_FILE",
+                        help="Record a Chrome trace of every phase and print the critical path")
+    parser.add_argument("--run-deadline", type=float, metavar="SECONDS",
+                        help="Overall deadline for generating one CV, late sections use fallback content")
+    parser.add_argument("--hedge-percentile", type=percentile, metavar="P",
+                        help="Send a duplicate request once a call is slower than this latency percentile")
+    parser.add_argument("--vacancy-token-budget", type=int, default=4000, metavar="TOKENS",
+                        help="Maximum tokens of cleaned vacancy text passed to the generators")
+    return parser.parse_args()
+
+def finish_trace(path):
+    """Export the recorded trace and print the critical path of the run."""
+    if path:
+        tracer.export(path)
+        tracer.print_critical_path()
+
 def main():
+    args = parse_args()
+    tracer.enabled = bool(args.trace)
+    latency_history.hedge_percentile = args.hedge_percentile
+
+    # Rendering stored results needs neither the API nor a vacancy description
+    if args.render_from:
+        render_from_results(args.render_from, pdf=args.pdf)
+        return
+
     # Load environment variables
     load_dotenv()
 
@@ -12,13 +66,23 @@ def main():
         print("Please set your OpenAI API key in a .env file or directly in the environment.")
         exit(1)
 
+    if args.batch:
+        print(f"\n=== Starting batch CV generation for {len(args.batch)} posting(s) ===")
+        run_batch(args.batch, results_path=args.results, journal_path=args.journal, resume=args.resume,
+                  run_deadline_seconds=args.run_deadline, vacancy_token_budget=args.vacancy_token_budget)
+        print(f"\n=== Batch complete, results saved to '{args.results}' ===")
+        finish_trace(args.trace)
+        return
+
     # Check if vacancy description exists
-    if not os.path.exists("vacancy_description.txt"):
-        print("Warning: 'vacancy_description.txt' not found. Please create this file with the job description.")
-        # Create an empty file as a placeholder
-        with open("vacancy_description.txt", "w", encoding="utf-8") as f:
-            f.write("Please replace this with the actual job description.")
-        print("Created an empty placeholder file. Please add the job description and run again.")
+    if not os.path.exists(args.vacancy):
+        print(f"Warning: '{args.vacancy}' not found. Please create this file with the job description.")
+        # A text placeholder would be misread as a PDF or HTML posting on the next run
+        if os.path.splitext(args.vacancy)[1].lower() not in (".pdf", ".html", ".htm"):
+            # Create an empty file as a placeholder
+            with open(args.vacancy, "w", encoding="utf-8") as f:
+                f.write("Please replace this with the actual job description.")
+            print("Created an empty placeholder file. Please add the job description and run again.")
         exit(1)
 
     # Check if CV template exists
@@ -31,10 +95,15 @@ def main():
 
     try:
         # Initialize and run the CV generator
-        cv_generator = CVGenerator()
+        cv_generator = CVGenerator(args.vacancy, journal_path=args.journal, resume=args.resume,
+                                   run_deadline_seconds=args.run_deadline, vacancy_token_budget=args.vacancy_token_budget)
         
+        # A resumed run skips the menu and finishes whatever the journal is missing
+        if args.resume:
+            cv_generator.generate_all_sections()
+
         # Run the interactive menu
-        while True:
+        while not args.resume:
             if not cv_generator.generate_cv():
                 break
             
@@ -43,6 +112,10 @@ def main():
             if choice != 'y':
                 break
 
+        if args.templates:
+            print(f"\nRendering {len(args.templates)} additional template(s)...")
+            cv_generator.render_templates(args.templates)
+
         # Print generated content for review
         print("\n=== Generated Content Review ===")
         print("\n=== Role Descriptions ===")
@@ -63,6 +136,10 @@ def main():
         print(f"Self-Study 0: {cv_generator.context.get('SELF_STUDY_0', 'No entry generated')}")
         print(f"Self-Study 1: {cv_generator.context.get('SELF_STUDY_1', 'No entry generated')}")
 
+        cv_generator.print_model_usage()
+
+        finish_trace(args.trace)
+
         print("\n=== CV Generation Complete ===")
         print("Your updated CV has been saved as 'CV.docx'")
 
@@ -0,0 +1,127 @@
+import os
+import re
+import zipfile
+from xml.dom import minidom
+
+import pytest
+
+from cv_generator.cv_generator import CVGenerator
+from cv_generator.fast_renderer import DOCUMENT_PART, FastDocxTemplate, _bold_properties
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(REPO_ROOT, "CV_template.docx")
+
+EXPECTED_SLOTS = [
+    "ROLE_SUMMARY",
+    "ROLE_SKILLS_PROGRAMMING",
+    "ROLE_SKILLS_TECHNICAL",
+    "ROLE_SKILLS_SOFT",
+    "ROLE_DESCRIPTION_LUCID_0",
+    "ROLE_DESCRIPTION_LUCID_1",
+    "ROLE_DESCRIPTION_GALAXY_0",
+    "ROLE_DESCRIPTION_GALAXY_1",
+    "ROLE_DESCRIPTION_GALAXY_2",
+    "ROLE_DESCRIPTION_GALAXY_3",
+    "ROLE_DESCRIPTION_WHIMSY_0",
+    "ROLE_DESCRIPTION_WHIMSY_1",
+    "ROLE_DESCRIPTION_APPSIDE_0",
+    "ROLE_DESCRIPTION_WOUFF_0",
+    "SELF_STUDY_0",
+    "SELF_STUDY_1",
+]
+
+
+def _document_xml(path):
+    with zipfile.ZipFile(path) as docx:
+        return docx.read(DOCUMENT_PART).decode("utf-8")
+
+
+def _visible_text(xml):
+    return "".join(re.findall(r'<w:t(?:\s[^>]*)?>(.*?)</w:t>', xml))
+
+
+def test_compiles_every_placeholder_into_a_slot():
+    template = FastDocxTemplate(TEMPLATE_PATH)
+
+    slots = [chunk[0] for chunk in template.chunks if not isinstance(chunk, str)]
+    assert slots == EXPECTED_SLOTS
+
+
+def test_render_escapes_text_and_copies_other_members(tmp_path):
+    output_path = str(tmp_path / "CV.docx")
+    context = {key: f"Text for {key}" for key in EXPECTED_SLOTS}
+    context["ROLE_SUMMARY"] = "Unity & C# <multiplayer> specialist"
+
+    FastDocxTemplate(TEMPLATE_PATH).render(context, output_path)
+
+    xml = _document_xml(output_path)
+    minidom.parseString(xml)
+    assert "Unity &amp; C# &lt;multiplayer&gt; specialist" in xml
+    assert "{{" not in _visible_text(xml)
+    for key in EXPECTED_SLOTS[1:]:
+        assert f"Text for {key}" in xml
+
+    with zipfile.ZipFile(TEMPLATE_PATH) as template, zipfile.ZipFile(output_path) as output:
+        assert template.namelist() == output.namelist()
+        for name in template.namelist():
+            if name != DOCUMENT_PART:
+                assert template.read(name) == output.read(name)
+
+
+def test_bold_parts_insert_bold_in_schema_order(tmp_path):
+    output_path = str(tmp_path / "CV.docx")
+    context = {
+        "ROLE_DESCRIPTION_LUCID_0": [
+            {"text": "Cut load times by "},
+            {"text": "40%", "bold": True},
+        ],
+    }
+
+    FastDocxTemplate(TEMPLATE_PATH).render(context, output_path)
+
+    runs = re.findall(r'<w:r>(?:(?!</w:r>).)*</w:r>', _document_xml(output_path))
+    bold_run = next(run for run in runs if ">40%</w:t>" in run)
+    plain_run = next(run for run in runs if ">Cut load times by </w:t>" in run)
+    assert bold_run.startswith('<w:r><w:rPr><w:b/><w:color w:val="1D1C1D"/></w:rPr>')
+    assert "<w:b/>" not in plain_run
+
+
+def test_bold_properties_follow_style_and_fonts():
+    rpr = '<w:rPr><w:rStyle w:val="Emphasis"/><w:rFonts w:ascii="Arial"/><w:color w:val="1D1C1D"/></w:rPr>'
+
+    assert _bold_properties(rpr) == (
+        '<w:rPr><w:rStyle w:val="Emphasis"/><w:rFonts w:ascii="Arial"/><w:b/><w:color w:val="1D1C1D"/></w:rPr>'
+    )
+    assert _bold_properties("") == "<w:rPr><w:b/></w:rPr>"
+    assert _bold_properties("<w:rPr><w:b/></w:rPr>") == "<w:rPr><w:b/></w:rPr>"
+
+
+@pytest.fixture
+def conditional_template(tmp_path):
+    """A copy of the CV template whose summary is wrapped in a Jinja conditional."""
+    path = str(tmp_path / "CV_template_conditional.docx")
+    with zipfile.ZipFile(TEMPLATE_PATH) as source, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            data = source.read(info.filename)
+            if info.filename == DOCUMENT_PART:
+                data = data.replace(
+                    b"{{ROLE_SUMMARY}}",
+                    b"{% if ROLE_SUMMARY %}{{ROLE_SUMMARY}}{% endif %}",
+                )
+            target.writestr(info, data)
+    return path
+
+
+def test_conditional_template_falls_back_to_docxtpl(conditional_template, tmp_path):
+    with pytest.raises(ValueError):
+        FastDocxTemplate(conditional_template)
+
+    output_path = str(tmp_path / "CV.docx")
+    cv_generator = CVGenerator(None, template_path=conditional_template,
+                               journal_path=str(tmp_path / "journal.jsonl"))
+    cv_generator.context = {"ROLE_SUMMARY": "Rendered <BOLD>by docxtpl</BOLD>"}
+
+    assert cv_generator.render_template(output_path)
+    text = _visible_text(_document_xml(output_path))
+    assert "Rendered by docxtpl" in text
+    assert "{%" not in text
@@ -0,0 +1,109 @@
+import pytest
+
+from cv_generator.vacancy_ingestion import VacancyIngestion, count_tokens, looks_like_heading
+
+
+def _ingest(tmp_path, text, name="vacancy.txt", token_budget=4000):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    ingestion = VacancyIngestion(token_budget)
+    ingestion.ingest(str(path))
+    return ingestion
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("Requirements:", True),
+    ("BENEFITS", True),
+    ("What We Offer", True),
+    ("About Dreams on a Pillow", True),
+    ("Privacy-by-design mindset", False),
+    ("Expert knowledge of Unity and C#.", False),
+    ("- Benefits", False),
+    ("2. Unity Netcode", False),
+    ("A Very Long Title Case Line That Goes On And On Well Past Sixty Characters", False),
+])
+def test_looks_like_heading(line, expected):
+    assert looks_like_heading(line) is expected
+
+
+def test_bullet_starting_with_boilerplate_word_does_not_skip(tmp_path):
+    ingestion = _ingest(tmp_path, "Requirements:\nPrivacy-by-design mindset\nStrong C# skills\n")
+
+    assert ingestion.text.splitlines() == ["Requirements:", "Privacy-by-design mindset", "Strong C# skills"]
+    assert ingestion.report["boilerplate_tokens"] == 0
+
+
+def test_boilerplate_section_ends_at_the_next_heading(tmp_path):
+    ingestion = _ingest(tmp_path, (
+        "Requirements:\n"
+        "Unity expert\n"
+        "Benefits\n"
+        "free snacks and a gym membership\n"
+        "Unity Netcode\n"
+        "C# Expert\n"
+    ))
+
+    assert ingestion.text.splitlines() == ["Requirements:", "Unity expert", "Unity Netcode", "C# Expert"]
+    assert ingestion.report["boilerplate_tokens"] == (
+        count_tokens("Benefits") + count_tokens("free snacks and a gym membership"))
+
+
+def test_sentence_case_relevant_heading_ends_skipped_section(tmp_path):
+    ingestion = _ingest(tmp_path, "What we offer:\nfree snacks\nWhat you will do\nship games\n")
+
+    assert ingestion.text.splitlines() == ["What you will do", "ship games"]
+
+
+def test_boilerplate_lines_are_dropped_anywhere(tmp_path):
+    ingestion = _ingest(tmp_path, "Programming Lead\nApply for this Job\nA share icon\nLead the team\n")
+
+    assert ingestion.text.splitlines() == ["Programming Lead", "Lead the team"]
+
+
+def test_duplicate_lines_are_kept_once(tmp_path):
+    ingestion = _ingest(tmp_path, "Ship games with Unity\nship  games with UNITY\nLead the team\n")
+
+    assert ingestion.text.splitlines() == ["Ship games with Unity", "Lead the team"]
+    assert ingestion.report["duplicate_tokens"] == count_tokens("ship games with UNITY")
+
+
+def test_budget_stops_at_the_first_line_that_does_not_fit(tmp_path):
+    first = "Build gameplay systems in Unity"
+    too_long = "Optimize rendering, memory and loading times across every supported mobile platform"
+    short = "Ship"
+    budget = count_tokens(first) + count_tokens(short)
+
+    ingestion = _ingest(tmp_path, f"{first}\n{too_long}\n{short}\n", token_budget=budget)
+
+    assert ingestion.text == first
+    assert ingestion.report["budget_tokens"] == count_tokens(too_long) + count_tokens(short)
+
+
+def test_plain_text_reports_no_markup_tokens(tmp_path):
+    ingestion = _ingest(tmp_path, "  Requirements:  \n\n\tUnity    expert\t\n")
+
+    assert ingestion.report["markup_tokens"] == 0
+    assert ingestion.report["raw_tokens"] == ingestion.report["kept_tokens"]
+
+
+def test_html_saved_as_text_is_parsed_as_markup(tmp_path):
+    ingestion = _ingest(tmp_path, (
+        "<html><body><nav>Jobs menu</nav>"
+        "<h2>Responsibilities</h2><ul><li>Build Unity tools</li></ul>"
+        "<h3>Why join us?</h3><p>free snacks</p>"
+        "<h2>About the team</h2><p>small studio</p>"
+        "</body></html>"
+    ))
+
+    assert ingestion.text.splitlines() == ["Responsibilities", "Build Unity tools", "About the team", "small studio"]
+    assert ingestion.report["markup_tokens"] > 0
+
+
+def test_source_hash_does_not_depend_on_the_budget(tmp_path):
+    text = "Requirements:\nUnity expert\nStrong C# skills\n"
+
+    full = _ingest(tmp_path, text)
+    clipped = _ingest(tmp_path, text, token_budget=count_tokens("Requirements:"))
+
+    assert full.text != clipped.text
+    assert full.source_hash == clipped.source_hash